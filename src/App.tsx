@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useState, useMemo } from 'react';
 import { BarChart3, AlertCircle, ArrowLeft } from 'lucide-react';
 import SimpleFileUpload from './components/SimpleFileUpload';
 import DynamicFilters from './components/DynamicFilters';
@@ -17,7 +17,21 @@ const App: React.FC = () => {
   const [selectedWeeks, setSelectedWeeks] = useState<string[]>([]);
   const [selectedCountries, setSelectedCountries] = useState<string[]>([]);
   const [selectedPaymentOptions, setSelectedPaymentOptions] = useState<string[]>([]);
-  const [validPaymentOptions, setValidPaymentOptions] = useState<string[]>([]);
+
+  // 筛选选项只在数据处理完成后生成一次，避免每次渲染重新创建
+  const filterOptions = useMemo(() => {
+    if (!dashboardData) {
+      return null;
+    }
+
+    const toOptions = (values: string[]) => values.map(value => ({ value, label: value }));
+    return {
+      psps: toOptions(dashboardData.filterOptions.psps),
+      weeks: toOptions(dashboardData.filterOptions.weeks),
+      countries: toOptions(dashboardData.filterOptions.countries),
+      paymentOptions: toOptions(dashboardData.filterOptions.paymentOptions)
+    };
+  }, [dashboardData]);
 
   const handleFileSelected = async (file: File) => {
     console.log('File selected for processing:', file);
@@ -118,39 +132,8 @@ const App: React.FC = () => {
     setSelectedWeeks([]);
     setSelectedCountries([]);
     setSelectedPaymentOptions([]);
-    setValidPaymentOptions([]);
   };
 
-  // 更新Payment Options有效性的函数
-  const updateValidPaymentOptions = (
-    psps: string[],
-    weeks: string[],
-    countries: string[]
-  ) => {
-    if (!rawData || rawData.length === 0) {
-      setValidPaymentOptions([]);
-      return;
-    }
-
-    const validOptions = new Set<string>();
-    rawData.forEach(item => {
-      const pspMatch = psps.length === 0 || psps.includes(item.psp);
-      const weekMatch = weeks.length === 0 || weeks.includes(item.week);
-      const countryMatch = countries.length === 0 || countries.includes(item.country);
-
-      if (pspMatch && weekMatch && countryMatch && item.lastSelectedPaymentOption) {
-        validOptions.add(item.lastSelectedPaymentOption);
-      }
-    });
-
-    setValidPaymentOptions([...validOptions]);
-  };
-
-  // 当筛选器变化时更新有效的Payment Options
-  React.useEffect(() => {
-    updateValidPaymentOptions(selectedPSPs, selectedWeeks, selectedCountries);
-  }, [selectedPSPs, selectedWeeks, selectedCountries, rawData]);
-
   return (
     <div className="min-h-screen bg-gray-50">
       {/* Header */}
@@ -240,7 +223,7 @@ const App: React.FC = () => {
           </div>
         )}
 
-        {currentView === 'dashboard' && dashboardData && (
+        {currentView === 'dashboard' && dashboardData && filterOptions && (
           <div className="space-y-6">
             {/* Data Summary */}
             <div className="bg-white rounded-lg shadow-sm border p-6">
@@ -269,11 +252,10 @@ const App: React.FC = () => {
 
             {/* Filters */}
             <DynamicFilters
-              psps={dashboardData.filterOptions.psps.map(psp => ({ value: psp, label: psp }))}
-              weeks={dashboardData.filterOptions.weeks.map(week => ({ value: week, label: week }))}
-              countries={dashboardData.filterOptions.countries.map(country => ({ value: country, label: country }))}
-              paymentOptions={dashboardData.filterOptions.paymentOptions.map(option => ({ value: option, label: option }))}
-              validPaymentOptions={validPaymentOptions}
+              psps={filterOptions.psps}
+              weeks={filterOptions.weeks}
+              countries={filterOptions.countries}
+              paymentOptions={filterOptions.paymentOptions}
               rawData={rawData}
               onPSPChange={setSelectedPSPs}
               onWeekChange={setSelectedWeeks}
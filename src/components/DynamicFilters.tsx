@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useMemo } from 'react';
 import { ChevronDown, X, Filter } from 'lucide-react';
 
 interface FilterOption {
@@ -11,7 +11,6 @@ interface DynamicFiltersProps {
   weeks: FilterOption[];
   countries: FilterOption[];
   paymentOptions: FilterOption[];
-  validPaymentOptions?: string[]; // 动态有效的Payment Options
   rawData?: WeeklyData[]; // 原始数据用于联动过滤
   onPSPChange: (selected: string[]) => void;
   onWeekChange: (selected: string[]) => void;
@@ -27,12 +26,13 @@ interface WeeklyData {
   lastSelectedPaymentOption?: string;
 }
 
-const MultiSelectDropdown: React.FC<{
+// 使用 memo：某个筛选器变化时，其余下拉框不重新渲染
+const MultiSelectDropdown = React.memo<{
   options: FilterOption[];
   selected: string[];
   onChange: (selected: string[]) => void;
   placeholder: string;
-}> = ({ options, selected, onChange, placeholder }) => {
+}>(({ options, selected, onChange, placeholder }) => {
   const [isOpen, setIsOpen] = useState(false);
 
   const handleSelect = (value: string) => {
@@ -104,14 +104,13 @@ const MultiSelectDropdown: React.FC<{
       )}
     </div>
   );
-};
+});
 
 const DynamicFilters: React.FC<DynamicFiltersProps> = ({
   psps,
   weeks,
   countries,
   paymentOptions,
-  validPaymentOptions = [],
   rawData = [],
   onPSPChange,
   onWeekChange,
@@ -134,11 +133,15 @@ const DynamicFilters: React.FC<DynamicFiltersProps> = ({
       return [];
     }
 
+    const pspSet = new Set(psps);
+    const weekSet = new Set(weeks);
+    const countrySet = new Set(countries);
+
     const validOptions = new Set<string>();
     rawData.forEach(item => {
-      const pspMatch = psps.length === 0 || psps.includes(item.psp);
-      const weekMatch = weeks.length === 0 || weeks.includes(item.week);
-      const countryMatch = countries.length === 0 || countries.includes(item.country);
+      const pspMatch = pspSet.size === 0 || pspSet.has(item.psp);
+      const weekMatch = weekSet.size === 0 || weekSet.has(item.week);
+      const countryMatch = countrySet.size === 0 || countrySet.has(item.country);
 
       if (pspMatch && weekMatch && countryMatch && item.lastSelectedPaymentOption) {
         validOptions.add(item.lastSelectedPaymentOption);
@@ -162,10 +165,13 @@ const DynamicFilters: React.FC<DynamicFiltersProps> = ({
     }
   }, [selectedPSPs, selectedWeeks, selectedCountries, rawData]);
 
-  // 使用动态计算的有效选项或传入的有效选项
-  const effectiveValidPaymentOptions = dynamicValidPaymentOptions.length > 0
-    ? dynamicValidPaymentOptions
-    : validPaymentOptions;
+  // 缓存下拉框选项数组，避免每次渲染生成新数组导致 Payment Option 下拉框重新渲染
+  const paymentOptionItems = useMemo(
+    () => dynamicValidPaymentOptions.length > 0
+      ? dynamicValidPaymentOptions.map(po => ({ value: po, label: po }))
+      : paymentOptions,
+    [dynamicValidPaymentOptions, paymentOptions]
+  );
 
   React.useEffect(() => {
     onPSPChange(selectedPSPs);
@@ -254,26 +260,22 @@ const DynamicFilters: React.FC<DynamicFiltersProps> = ({
         {/* Payment Option Filter */}
         <div>
           <label className="block text-sm font-medium text-gray-700 mb-2">
-            Payment Option ({selectedPaymentOptions.length}/{effectiveValidPaymentOptions.length || paymentOptions.length})
+            Payment Option ({selectedPaymentOptions.length}/{dynamicValidPaymentOptions.length || paymentOptions.length})
           </label>
           <MultiSelectDropdown
-            options={
-              effectiveValidPaymentOptions.length > 0
-                ? effectiveValidPaymentOptions.map(po => ({ value: po, label: po }))
-                : paymentOptions
-            }
+            options={paymentOptionItems}
             selected={selectedPaymentOptions}
             onChange={setSelectedPaymentOptions}
-            placeholder={effectiveValidPaymentOptions.length > 0 ? "Select Payment Options" : "No payment options available"}
+            placeholder={dynamicValidPaymentOptions.length > 0 ? "Select Payment Options" : "No payment options available"}
           />
-          {effectiveValidPaymentOptions.length === 0 && paymentOptions.length > 0 && (
+          {dynamicValidPaymentOptions.length === 0 && paymentOptions.length > 0 && (
             <p className="text-xs text-gray-500 mt-1">
               Select countries or other filters to see available payment options
             </p>
           )}
-          {effectiveValidPaymentOptions.length > 0 && (
+          {dynamicValidPaymentOptions.length > 0 && (
             <p className="text-xs text-green-600 mt-1">
-              {effectiveValidPaymentOptions.length} payment option{effectiveValidPaymentOptions.length !== 1 ? 's' : ''} available for your selection
+              {dynamicValidPaymentOptions.length} payment option{dynamicValidPaymentOptions.length !== 1 ? 's' : ''} available for your selection
             </p>
           )}
         </div>
@@ -347,4 +349,5 @@ const DynamicFilters: React.FC<DynamicFiltersProps> = ({
   );
 };
 
-export default DynamicFilters;
\ No newline at end of file
+// 使用 memo：筛选选项不变时，父组件更新不会重新渲染筛选面板
+export default React.memo(DynamicFilters);
\ No newline at end of file
@@ -12,6 +12,7 @@ import {
 import { AggregatedPSPData } from '../utils/dashboardProcessor';
 import { WeeklyData } from '../types';
 import { QlikStyleProcessor, QlikMetricsData } from '../utils/qlikProcessor';
+import { SERIES_COLORS, LINE_DOT, LINE_ACTIVE_DOT } from '../utils/chartStyles';
 import ToggleButton from './ToggleButton';
 
 interface ImprovedDynamicChartProps {
@@ -23,6 +24,9 @@ interface ImprovedDynamicChartProps {
   selectedPaymentOptions: string[];
 }
 
+// 超过该点数时折线不再绘制每个数据点
+const MAX_POINTS_WITH_DOTS = 60;
+
 interface MetricConfig {
   key: string;
   label: string;
@@ -31,6 +35,31 @@ interface MetricConfig {
   chartType: 'line' | 'bar';
 }
 
+// 指标配置
+const METRICS: MetricConfig[] = [
+  {
+    key: 'totalPressBuyCount',
+    label: 'Total Press Buy Count',
+    color: '#3b82f6',
+    format: 'number',
+    chartType: 'line'
+  },
+  {
+    key: 'totalConvertedCount',
+    label: 'Total Converted Count',
+    color: '#10b981',
+    format: 'number',
+    chartType: 'line'
+  },
+  {
+    key: 'conversionRate',
+    label: 'Conversion Rate (%)',
+    color: '#f59e0b',
+    format: 'percentage',
+    chartType: 'line' // 改为线图
+  }
+];
+
 const ImprovedDynamicChart: React.FC<ImprovedDynamicChartProps> = ({
   data,
   originalData,
@@ -42,59 +71,11 @@ const ImprovedDynamicChart: React.FC<ImprovedDynamicChartProps> = ({
   const [selectedMetric, setSelectedMetric] = useState<string>('totalPressBuyCount');
   const [showPercentage, setShowPercentage] = useState<boolean>(false);
 
-  // 指标配置
-  const metrics: MetricConfig[] = [
-    {
-      key: 'totalPressBuyCount',
-      label: 'Total Press Buy Count',
-      color: '#3b82f6',
-      format: 'number',
-      chartType: 'line'
-    },
-    {
-      key: 'totalConvertedCount',
-      label: 'Total Converted Count',
-      color: '#10b981',
-      format: 'number',
-      chartType: 'line'
-    },
-    {
-      key: 'conversionRate',
-      label: 'Conversion Rate (%)',
-      color: '#f59e0b',
-      format: 'percentage',
-      chartType: 'line' // 改为线图
-    }
-  ];
-
-  const currentMetric = metrics.find(m => m.key === selectedMetric) || metrics[0];
+  const currentMetric = METRICS.find(m => m.key === selectedMetric) || METRICS[0];
 
-  // 使用QlikStyle动态计算数据
+  // 使用QlikStyle动态计算数据（按筛选组合缓存）
   const qlikMetricsData = useMemo(() => {
-    if (selectedPSPs.length > 0) {
-      // PSP维度：为每个选中的PSP分别计算指标
-      return QlikStyleProcessor.calculatePSPMetrics(
-        originalData,
-        selectedPSPs,
-        selectedWeeks,
-        selectedCountries,
-        selectedPaymentOptions
-      );
-    } else {
-      // Global维度：计算全局指标
-      return QlikStyleProcessor.calculateMetrics(
-        originalData,
-        selectedPSPs,
-        selectedWeeks,
-        selectedCountries,
-        selectedPaymentOptions
-      );
-    }
-  }, [originalData, selectedPSPs, selectedWeeks, selectedCountries, selectedPaymentOptions]);
-
-  // 计算总体指标
-  const totalMetrics = useMemo(() => {
-    return QlikStyleProcessor.calculateTotalMetrics(
+    return QlikStyleProcessor.calculateChartMetrics(
       originalData,
       selectedPSPs,
       selectedWeeks,
@@ -103,6 +84,11 @@ const ImprovedDynamicChart: React.FC<ImprovedDynamicChartProps> = ({
     );
   }, [originalData, selectedPSPs, selectedWeeks, selectedCountries, selectedPaymentOptions]);
 
+  // 计算总体指标：复用按周汇总的结果，不再重新筛选原始数据
+  const totalMetrics = useMemo(() => {
+    return QlikStyleProcessor.summarizeMetrics(qlikMetricsData);
+  }, [qlikMetricsData]);
+
   // 根据当前指标提取值
   const displayData = useMemo(() => {
     return qlikMetricsData.map(item => {
@@ -166,11 +152,9 @@ const ImprovedDynamicChart: React.FC<ImprovedDynamicChartProps> = ({
     return ['Global Trend'];
   }, [selectedPSPs]);
 
-  // 颜色配置
-  const colors = ['#3b82f6', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6', '#ec4899', '#14b8a6', '#f97316'];
   const getColorForSeries = (series: string, index: number) => {
     if (series === 'Global Trend') return currentMetric.color;
-    return colors[index % colors.length];
+    return SERIES_COLORS[index % SERIES_COLORS.length];
   };
 
   // 自定义Tooltip
@@ -204,6 +188,31 @@ const ImprovedDynamicChart: React.FC<ImprovedDynamicChartProps> = ({
     return null;
   };
 
+  // 准备图表数据
+  const chartData = useMemo(() => {
+    return displayData.map(item => {
+      const chartItem: any = { week: (item as any).week };
+
+      if (selectedPSPs.length > 0) {
+        // PSP维度：每个PSP作为一个系列
+        selectedPSPs.forEach(psp => {
+          chartItem[psp] = (item as any)[psp] || 0;
+        });
+      } else {
+        // 全局趋势：只有一个系列
+        chartItem.value = (item as any).value || 0;
+      }
+
+      return chartItem;
+    });
+  }, [displayData, selectedPSPs]);
+
+  // 周数只随数据变化，不在每次渲染时重新去重
+  const weekCount = useMemo(() => new Set(data.map(d => d.week)).size, [data]);
+
+  // 点数较多时不逐点绘制圆点、关闭动画，减少SVG节点数量
+  const showDots = chartData.length <= MAX_POINTS_WITH_DOTS;
+
   if (qlikMetricsData.length === 0) {
     return (
       <div className="bg-white rounded-lg shadow-sm border p-8 text-center">
@@ -215,23 +224,6 @@ const ImprovedDynamicChart: React.FC<ImprovedDynamicChartProps> = ({
     );
   }
 
-  // 准备图表数据
-  const chartData = displayData.map(item => {
-    const chartItem: any = { week: (item as any).week };
-
-    if (selectedPSPs.length > 0) {
-      // PSP维度：每个PSP作为一个系列
-      selectedPSPs.forEach(psp => {
-        chartItem[psp] = (item as any)[psp] || 0;
-      });
-    } else {
-      // 全局趋势：只有一个系列
-      chartItem.value = (item as any).value || 0;
-    }
-
-    return chartItem;
-  });
-
   return (
     <div className="bg-white rounded-lg shadow-sm border p-6">
       {/* 控制面板 */}
@@ -245,7 +237,7 @@ const ImprovedDynamicChart: React.FC<ImprovedDynamicChartProps> = ({
               onChange={(e) => setSelectedMetric(e.target.value)}
               className="px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent"
             >
-              {metrics.map(metric => (
+              {METRICS.map(metric => (
                 <option key={metric.key} value={metric.key}>
                   {metric.label}
                 </option>
@@ -271,7 +263,7 @@ const ImprovedDynamicChart: React.FC<ImprovedDynamicChartProps> = ({
           </div>
           <div className="text-center p-3 bg-green-50 rounded-lg">
             <div className="text-lg font-semibold text-green-600">
-              {[...new Set(data.map(d => d.week))].length}
+              {weekCount}
             </div>
             <div className="text-sm text-gray-600">Weeks</div>
           </div>
@@ -330,7 +322,9 @@ const ImprovedDynamicChart: React.FC<ImprovedDynamicChartProps> = ({
                   name={psp}
                   stroke={getColorForSeries(psp, index)}
                   strokeWidth={2}
-                  dot={{ r: 4 }}
+                  dot={showDots ? LINE_DOT : false}
+                  activeDot={LINE_ACTIVE_DOT}
+                  isAnimationActive={showDots}
                 />
               ))
             ) : (
@@ -341,7 +335,9 @@ const ImprovedDynamicChart: React.FC<ImprovedDynamicChartProps> = ({
                 name="Global Trend"
                 stroke={currentMetric.color}
                 strokeWidth={2}
-                dot={{ r: 4 }}
+                dot={showDots ? LINE_DOT : false}
+                activeDot={LINE_ACTIVE_DOT}
+                isAnimationActive={showDots}
               />
             )}
           </LineChart>
@@ -351,4 +347,5 @@ const ImprovedDynamicChart: React.FC<ImprovedDynamicChartProps> = ({
   );
 };
 
-export default ImprovedDynamicChart;
\ No newline at end of file
+// 使用 memo：只有筛选条件或数据变化时才重新计算和渲染图表
+export default React.memo(ImprovedDynamicChart);
\ No newline at end of file
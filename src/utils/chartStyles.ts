@@ -0,0 +1,15 @@
+// 图表系列颜色，按系列序号循环使用
+export const SERIES_COLORS = [
+  '#3b82f6', // blue
+  '#10b981', // green
+  '#f59e0b', // amber
+  '#ef4444', // red
+  '#8b5cf6', // violet
+  '#ec4899', // pink
+  '#14b8a6', // teal
+  '#f97316', // orange
+];
+
+// 折线数据点样式，所有系列共用同一对象
+export const LINE_DOT = { r: 4 };
+export const LINE_ACTIVE_DOT = { r: 5 };
@@ -26,65 +26,91 @@ export interface DashboardData {
 }
 
 export class DynamicDashboardProcessor {
+  // 同一份解析结果只处理一次
+  private static dashboardCache = new WeakMap<WeeklyData[], DashboardData>();
+
   static processForDashboard(data: WeeklyData[]): DashboardData {
-    // 按PSP和周分组，聚合所有国家的数据
-    const groupedByPSPWeek = new Map<string, WeeklyData[]>();
+    const cached = this.dashboardCache.get(data);
+    if (cached) {
+      return cached;
+    }
+
+    // 一次遍历按PSP和周汇总所有国家的数据，不为每个分组保存原始行
+    // PSP和周直接保存在汇总项上，不再从拼接的分组键中拆分
+    const groupedByPSPWeek = new Map<string, {
+      psp: string;
+      week: string;
+      totalPressBuyCount: number;
+      totalConvertedCount: number;
+      // 同一国家的多行（如不同支付方式）合并为一条，避免重复保存每行的数值
+      countryTotals: Map<string, { country: string; pressBuyCount: number; convertedCount: number }>;
+    }>();
+
+    const allCountries = new Set<string>();
+    const allPaymentOptions = new Set<string>();
 
     for (const item of data) {
-      const key = `${item.psp}-${item.week}`;
-      if (!groupedByPSPWeek.has(key)) {
-        groupedByPSPWeek.set(key, []);
+      const key = `${item.psp}\u0000${item.week}`;
+      let group = groupedByPSPWeek.get(key);
+      if (!group) {
+        group = {
+          psp: item.psp,
+          week: item.week,
+          totalPressBuyCount: 0,
+          totalConvertedCount: 0,
+          countryTotals: new Map()
+        };
+        groupedByPSPWeek.set(key, group);
+      }
+      group.totalPressBuyCount += item.pressBuyCount;
+      group.totalConvertedCount += item.convertedCount;
+
+      const countryTotal = group.countryTotals.get(item.country);
+      if (countryTotal) {
+        countryTotal.pressBuyCount += item.pressBuyCount;
+        countryTotal.convertedCount += item.convertedCount;
+      } else {
+        group.countryTotals.set(item.country, {
+          country: item.country,
+          pressBuyCount: item.pressBuyCount,
+          convertedCount: item.convertedCount
+        });
+      }
+
+      allCountries.add(item.country);
+      if (item.lastSelectedPaymentOption) {
+        allPaymentOptions.add(item.lastSelectedPaymentOption);
       }
-      groupedByPSPWeek.get(key)!.push(item);
     }
 
     const aggregatedData: AggregatedPSPData[] = [];
     const allPSPs = new Set<string>();
     const allWeeks = new Set<string>();
-    const allCountries = new Set<string>();
-    const allPaymentOptions = new Set<string>();
 
     // 处理每个PSP-周组合
-    for (const [key, items] of groupedByPSPWeek.entries()) {
-      const [psp, week] = key.split('-');
+    for (const group of groupedByPSPWeek.values()) {
+      const { psp, week, totalPressBuyCount, totalConvertedCount } = group;
       allPSPs.add(psp);
       allWeeks.add(week);
 
-      // 聚合所有国家的数据
-      const totalPressBuyCount = items.reduce((sum, item) => sum + item.pressBuyCount, 0);
-      const totalConvertedCount = items.reduce((sum, item) => sum + item.convertedCount, 0);
-      const conversionRate = totalPressBuyCount > 0 ? (totalConvertedCount / totalPressBuyCount) * 100 : 0;
-
-      // 收集国家明细
-      const countryBreakdown = items.map(item => ({
-        country: item.country,
-        pressBuyCount: item.pressBuyCount,
-        convertedCount: item.convertedCount
-      }));
-
-      countryBreakdown.forEach(cb => allCountries.add(cb.country));
-      items.forEach(item => {
-        if (item.lastSelectedPaymentOption) {
-          allPaymentOptions.add(item.lastSelectedPaymentOption);
-        }
-      });
+      const conversionRate = totalPressBuyCount > 0 ? Math.round((totalConvertedCount / totalPressBuyCount) * 10000) / 100 : 0;
 
       aggregatedData.push({
         psp,
         week,
         totalPressBuyCount,
         totalConvertedCount,
-        conversionRate: Number(conversionRate.toFixed(2)),
+        conversionRate,
         pressBuyShare: 0, // 稍后计算
         convertedShare: 0, // 稍后计算
-        countryBreakdown
+        countryBreakdown: [...group.countryTotals.values()]
       });
     }
 
     // 计算基于PSP总量的shares（不是基于国家的）
     this.calculatePSPShares(aggregatedData);
 
-    return {
+    const result: DashboardData = {
       aggregatedData: aggregatedData.sort((a, b) => a.week.localeCompare(b.week)),
       filterOptions: {
         psps: [...allPSPs].sort(),
@@ -93,28 +119,28 @@ export class DynamicDashboardProcessor {
         paymentOptions: [...allPaymentOptions].sort()
       }
     };
+    this.dashboardCache.set(data, result);
+    return result;
   }
 
   private static calculatePSPShares(data: AggregatedPSPData[]): void {
-    // 按周分组计算PSP shares
-    const weeklyData = new Map<string, AggregatedPSPData[]>();
+    // 按周汇总总量，再计算PSP shares
+    const weeklyTotals = new Map<string, { pressBuy: number; converted: number }>();
 
     for (const item of data) {
-      if (!weeklyData.has(item.week)) {
-        weeklyData.set(item.week, []);
+      const totals = weeklyTotals.get(item.week);
+      if (totals) {
+        totals.pressBuy += item.totalPressBuyCount;
+        totals.converted += item.totalConvertedCount;
+      } else {
+        weeklyTotals.set(item.week, { pressBuy: item.totalPressBuyCount, converted: item.totalConvertedCount });
       }
-      weeklyData.get(item.week)!.push(item);
     }
 
-    // 为每周计算PSP shares
-    for (const [week, weekData] of weeklyData.entries()) {
-      const totalWeekPressBuy = weekData.reduce((sum, item) => sum + item.totalPressBuyCount, 0);
-      const totalWeekConverted = weekData.reduce((sum, item) => sum + item.totalConvertedCount, 0);
-
-      for (const item of weekData) {
-        item.pressBuyShare = totalWeekPressBuy > 0 ? (item.totalPressBuyCount / totalWeekPressBuy) * 100 : 0;
-        item.convertedShare = totalWeekConverted > 0 ? (item.totalConvertedCount / totalWeekConverted) * 100 : 0;
-      }
+    for (const item of data) {
+      const totals = weeklyTotals.get(item.week)!;
+      item.pressBuyShare = totals.pressBuy > 0 ? (item.totalPressBuyCount / totals.pressBuy) * 100 : 0;
+      item.convertedShare = totals.converted > 0 ? (item.totalConvertedCount / totals.converted) * 100 : 0;
     }
   }
 
@@ -0,0 +1,71 @@
+const DB_NAME = 'simplepoordashboard';
+const DB_VERSION = 1;
+const STORE_NAME = 'parsedWorkbooks';
+
+export class PersistentCache {
+  private static dbPromise: Promise<IDBDatabase> | null = null;
+
+  private static openDB(): Promise<IDBDatabase> {
+    if (!this.dbPromise) {
+      this.dbPromise = new Promise<IDBDatabase>((resolve, reject) => {
+        const request = indexedDB.open(DB_NAME, DB_VERSION);
+        request.onupgradeneeded = () => {
+          request.result.createObjectStore(STORE_NAME);
+        };
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+      });
+
+      // 打开失败时允许下次重试
+      this.dbPromise.catch(() => {
+        this.dbPromise = null;
+      });
+    }
+    return this.dbPromise;
+  }
+
+  /**
+   * 读取缓存，缓存不可用或未命中时返回 undefined
+   */
+  static async get<T>(key: string): Promise<T | undefined> {
+    if (typeof indexedDB === 'undefined') {
+      return undefined;
+    }
+
+    try {
+      const db = await this.openDB();
+      return await new Promise<T | undefined>((resolve, reject) => {
+        const request = db.transaction(STORE_NAME, 'readonly').objectStore(STORE_NAME).get(key);
+        request.onsuccess = () => resolve(request.result as T | undefined);
+        request.onerror = () => reject(request.error);
+      });
+    } catch (error) {
+      console.warn('Failed to read from persistent cache:', error);
+      return undefined;
+    }
+  }
+
+  /**
+   * 写入缓存，只保留最近一次的结果，避免占用过多浏览器存储
+   */
+  static async set<T>(key: string, value: T): Promise<void> {
+    if (typeof indexedDB === 'undefined') {
+      return;
+    }
+
+    try {
+      const db = await this.openDB();
+      await new Promise<void>((resolve, reject) => {
+        const transaction = db.transaction(STORE_NAME, 'readwrite');
+        const store = transaction.objectStore(STORE_NAME);
+        store.clear();
+        store.put(value, key);
+        transaction.oncomplete = () => resolve();
+        transaction.onerror = () => reject(transaction.error);
+        transaction.onabort = () => reject(transaction.error);
+      });
+    } catch (error) {
+      console.warn('Failed to write to persistent cache:', error);
+    }
+  }
+}
@@ -20,6 +20,77 @@ export interface QlikMetricsData {
 }
 
 export class QlikStyleProcessor {
+  // 按数据集缓存各筛选组合的计算结果，切换回之前的筛选条件时直接复用
+  private static metricsCache = new WeakMap<WeeklyData[], Map<string, QlikMetricsData[]>>();
+  private static readonly METRICS_CACHE_SIZE = 50;
+
+  /**
+   * 根据是否选择了PSP计算图表指标，并缓存每个筛选组合的结果
+   */
+  static calculateChartMetrics(
+    data: WeeklyData[],
+    selectedPSPs: string[],
+    selectedWeeks: string[],
+    selectedCountries: string[],
+    selectedPaymentOptions: string[]
+  ): QlikMetricsData[] {
+    const cacheKey = [selectedPSPs, selectedWeeks, selectedCountries, selectedPaymentOptions]
+      .map(selection => selection.join('\u0001'))
+      .join('\u0000');
+
+    let cache = this.metricsCache.get(data);
+    if (!cache) {
+      cache = new Map();
+      this.metricsCache.set(data, cache);
+    }
+
+    const cached = cache.get(cacheKey);
+    if (cached) {
+      return cached;
+    }
+
+    const metrics = selectedPSPs.length > 0
+      // PSP维度：为每个选中的PSP分别计算指标
+      ? this.calculatePSPMetrics(data, selectedPSPs, selectedWeeks, selectedCountries, selectedPaymentOptions)
+      // Global维度：计算全局指标
+      : this.calculateMetrics(data, selectedPSPs, selectedWeeks, selectedCountries, selectedPaymentOptions);
+
+    // 超出容量时淘汰最早缓存的组合
+    if (cache.size >= this.METRICS_CACHE_SIZE) {
+      const oldestKey = cache.keys().next().value;
+      if (oldestKey !== undefined) {
+        cache.delete(oldestKey);
+      }
+    }
+    cache.set(cacheKey, metrics);
+
+    return metrics;
+  }
+
+  /**
+   * 构建行筛选函数：选中值预先放入Set，逐行只做哈希查找
+   * 未选择的维度不参与筛选，没有支付方式的行不受支付方式筛选影响
+   */
+  private static createRowFilter(
+    selectedPSPs: string[],
+    selectedWeeks: string[],
+    selectedCountries: string[],
+    selectedPaymentOptions: string[]
+  ): (item: WeeklyData) => boolean {
+    const psps = new Set(selectedPSPs);
+    const weeks = new Set(selectedWeeks);
+    const countries = new Set(selectedCountries);
+    const paymentOptions = new Set(selectedPaymentOptions);
+
+    return item =>
+      (psps.size === 0 || psps.has(item.psp)) &&
+      (weeks.size === 0 || weeks.has(item.week)) &&
+      (countries.size === 0 || countries.has(item.country)) &&
+      (paymentOptions.size === 0 ||
+        !item.lastSelectedPaymentOption ||
+        paymentOptions.has(item.lastSelectedPaymentOption));
+  }
+
   /**
    * 根据筛选条件动态计算QlikStyle指标
    */
@@ -44,16 +115,9 @@ export class QlikStyleProcessor {
     }
 
     // 1. 首先根据筛选条件过滤原始数据
-    const filteredData = data.filter(item => {
-      const pspMatch = selectedPSPs.length === 0 || selectedPSPs.includes(item.psp);
-      const weekMatch = selectedWeeks.length === 0 || selectedWeeks.includes(item.week);
-      const countryMatch = selectedCountries.length === 0 || selectedCountries.includes(item.country);
-      const paymentMatch = selectedPaymentOptions.length === 0 ||
-        !item.lastSelectedPaymentOption ||
-        selectedPaymentOptions.includes(item.lastSelectedPaymentOption);
-
-      return pspMatch && weekMatch && countryMatch && paymentMatch;
-    });
+    const filteredData = data.filter(
+      this.createRowFilter(selectedPSPs, selectedWeeks, selectedCountries, selectedPaymentOptions)
+    );
 
     console.log(`  Filtered data length: ${filteredData.length}`);
     if (filteredData.length > 0) {
@@ -61,71 +125,69 @@ export class QlikStyleProcessor {
       console.log(`  Filtered total press buy: ${filteredData.reduce((sum, item) => sum + item.pressBuyCount, 0)}`);
     }
 
-    // 2. 按周分组计算Global指标
-    const weeklyGroups = new Map<string, WeeklyData[]>();
+    // 2. 一次遍历按周汇总，同时累加PSP和国家明细
+    const weeklyGroups = new Map<string, {
+      rowCount: number;
+      totalPressBuy: number;
+      totalConverted: number;
+      psps: Map<string, { pressBuy: number; converted: number }>;
+      countries: Map<string, { pressBuy: number; converted: number }>;
+    }>();
+
+    for (const item of filteredData) {
+      let weekGroup = weeklyGroups.get(item.week);
+      if (!weekGroup) {
+        weekGroup = { rowCount: 0, totalPressBuy: 0, totalConverted: 0, psps: new Map(), countries: new Map() };
+        weeklyGroups.set(item.week, weekGroup);
+      }
+      weekGroup.rowCount++;
+      weekGroup.totalPressBuy += item.pressBuyCount;
+      weekGroup.totalConverted += item.convertedCount;
+
+      const pspTotals = weekGroup.psps.get(item.psp);
+      if (pspTotals) {
+        pspTotals.pressBuy += item.pressBuyCount;
+        pspTotals.converted += item.convertedCount;
+      } else {
+        weekGroup.psps.set(item.psp, { pressBuy: item.pressBuyCount, converted: item.convertedCount });
+      }
 
-    filteredData.forEach(item => {
-      if (!weeklyGroups.has(item.week)) {
-        weeklyGroups.set(item.week, []);
+      const countryTotals = weekGroup.countries.get(item.country);
+      if (countryTotals) {
+        countryTotals.pressBuy += item.pressBuyCount;
+        countryTotals.converted += item.convertedCount;
+      } else {
+        weekGroup.countries.set(item.country, { pressBuy: item.pressBuyCount, converted: item.convertedCount });
       }
-      weeklyGroups.get(item.week)!.push(item);
-    });
+    }
 
     // 3. 为每周计算QlikStyle指标
     const result: QlikMetricsData[] = [];
 
     console.log(`  Weekly groups found: ${weeklyGroups.size}`);
-    for (const [week, weekData] of weeklyGroups.entries()) {
-      // 计算本周的总和
-      const totalPressBuy = weekData.reduce((sum, item) => sum + item.pressBuyCount, 0);
-      const totalConverted = weekData.reduce((sum, item) => sum + item.convertedCount, 0);
+    for (const [week, weekGroup] of weeklyGroups.entries()) {
+      const { totalPressBuy, totalConverted } = weekGroup;
       const conversionRate = totalPressBuy > 0 ? (totalConverted / totalPressBuy) * 100 : 0;
 
-      console.log(`  Week ${week}: ${weekData.length} rows, ${totalPressBuy} press buy, ${totalConverted} converted, ${conversionRate.toFixed(1)}% CR`);
-
-      // 按PSP分组计算明细
-      const pspGroups = new Map<string, WeeklyData[]>();
-      weekData.forEach(item => {
-        if (!pspGroups.has(item.psp)) {
-          pspGroups.set(item.psp, []);
-        }
-        pspGroups.get(item.psp)!.push(item);
-      });
+      console.log(`  Week ${week}: ${weekGroup.rowCount} rows, ${totalPressBuy} press buy, ${totalConverted} converted, ${conversionRate.toFixed(1)}% CR`);
 
       const pspBreakdown: QlikMetricsData['pspBreakdown'] = [];
-      for (const [psp, pspData] of pspGroups.entries()) {
-        const pspPressBuy = pspData.reduce((sum, item) => sum + item.pressBuyCount, 0);
-        const pspConverted = pspData.reduce((sum, item) => sum + item.convertedCount, 0);
-        const pspConversionRate = pspPressBuy > 0 ? (pspConverted / pspPressBuy) * 100 : 0;
-
+      for (const [psp, totals] of weekGroup.psps.entries()) {
         pspBreakdown.push({
           psp,
-          pressBuy: pspPressBuy,
-          converted: pspConverted,
-          conversionRate: pspConversionRate
+          pressBuy: totals.pressBuy,
+          converted: totals.converted,
+          conversionRate: totals.pressBuy > 0 ? (totals.converted / totals.pressBuy) * 100 : 0
         });
       }
 
-      // 按国家分组计算明细
-      const countryGroups = new Map<string, WeeklyData[]>();
-      weekData.forEach(item => {
-        if (!countryGroups.has(item.country)) {
-          countryGroups.set(item.country, []);
-        }
-        countryGroups.get(item.country)!.push(item);
-      });
-
       const countryBreakdown: QlikMetricsData['countryBreakdown'] = [];
-      for (const [country, countryData] of countryGroups.entries()) {
-        const countryPressBuy = countryData.reduce((sum, item) => sum + item.pressBuyCount, 0);
-        const countryConverted = countryData.reduce((sum, item) => sum + item.convertedCount, 0);
-        const countryConversionRate = countryPressBuy > 0 ? (countryConverted / countryPressBuy) * 100 : 0;
-
+      for (const [country, totals] of weekGroup.countries.entries()) {
         countryBreakdown.push({
           country,
-          pressBuy: countryPressBuy,
-          converted: countryConverted,
-          conversionRate: countryConversionRate
+          pressBuy: totals.pressBuy,
+          converted: totals.converted,
+          conversionRate: totals.pressBuy > 0 ? (totals.converted / totals.pressBuy) * 100 : 0
         });
       }
 
@@ -144,42 +206,21 @@ export class QlikStyleProcessor {
   }
 
   /**
-   * 计算总体的QlikStyle指标（不分周）
+   * 由已按周汇总的指标计算总体指标，无需再次筛选原始数据
    */
-  static calculateTotalMetrics(
-    data: WeeklyData[],
-    selectedPSPs: string[],
-    selectedWeeks: string[],
-    selectedCountries: string[],
-    selectedPaymentOptions: string[]
-  ): {
+  static summarizeMetrics(metrics: QlikMetricsData[]): {
     totalPressBuy: number;
     totalConverted: number;
     conversionRate: number;
   } {
-    console.log('🔢 calculateTotalMetrics - Debug:');
-    console.log(`  Input data length: ${data.length}`);
-    console.log(`  Selected PSPs: [${selectedPSPs.join(', ')}]`);
-    console.log(`  Selected Weeks: [${selectedWeeks.join(', ')}]`);
-
-    const filteredData = data.filter(item => {
-      const pspMatch = selectedPSPs.length === 0 || selectedPSPs.includes(item.psp);
-      const weekMatch = selectedWeeks.length === 0 || selectedWeeks.includes(item.week);
-      const countryMatch = selectedCountries.length === 0 || selectedCountries.includes(item.country);
-      const paymentMatch = selectedPaymentOptions.length === 0 ||
-        !item.lastSelectedPaymentOption ||
-        selectedPaymentOptions.includes(item.lastSelectedPaymentOption);
-
-      return pspMatch && weekMatch && countryMatch && paymentMatch;
-    });
-
-    console.log(`  Filtered data length: ${filteredData.length}`);
-    const totalPressBuy = filteredData.reduce((sum, item) => sum + item.pressBuyCount, 0);
-    const totalConverted = filteredData.reduce((sum, item) => sum + item.convertedCount, 0);
+    let totalPressBuy = 0;
+    let totalConverted = 0;
+    for (const item of metrics) {
+      totalPressBuy += item.totalPressBuy;
+      totalConverted += item.totalConverted;
+    }
     const conversionRate = totalPressBuy > 0 ? (totalConverted / totalPressBuy) * 100 : 0;
 
-    console.log(`  Final totals: ${totalPressBuy} press buy, ${totalConverted} converted, ${conversionRate.toFixed(1)}% CR`);
-
     return {
       totalPressBuy,
       totalConverted,
@@ -202,25 +243,36 @@ export class QlikStyleProcessor {
       return [];
     }
 
-    // 为每个选中的PSP计算指标
-    const result: QlikMetricsData[] = [];
+    // 一次遍历按周、PSP汇总，而不是为每个周和PSP组合重新扫描全部数据
+    const weekPSPTotals = new Map<string, Map<string, { pressBuy: number; converted: number }>>();
+
+    const matchesFilters = this.createRowFilter(selectedPSPs, selectedWeeks, selectedCountries, selectedPaymentOptions);
 
-    // 获取所有相关的周
-    const relevantWeeks = [...new Set(
-      data
-        .filter(item => {
-          const pspMatch = selectedPSPs.includes(item.psp);
-          const weekMatch = selectedWeeks.length === 0 || selectedWeeks.includes(item.week);
-          const countryMatch = selectedCountries.length === 0 || selectedCountries.includes(item.country);
-          const paymentMatch = selectedPaymentOptions.length === 0 ||
-            !item.lastSelectedPaymentOption ||
-            selectedPaymentOptions.includes(item.lastSelectedPaymentOption);
-          return pspMatch && weekMatch && countryMatch && paymentMatch;
-        })
-        .map(item => item.week)
-    )].sort();
+    for (const item of data) {
+      if (!matchesFilters(item)) {
+        continue;
+      }
+
+      let pspTotals = weekPSPTotals.get(item.week);
+      if (!pspTotals) {
+        pspTotals = new Map();
+        weekPSPTotals.set(item.week, pspTotals);
+      }
+
+      const totals = pspTotals.get(item.psp);
+      if (totals) {
+        totals.pressBuy += item.pressBuyCount;
+        totals.converted += item.convertedCount;
+      } else {
+        pspTotals.set(item.psp, { pressBuy: item.pressBuyCount, converted: item.convertedCount });
+      }
+    }
+
+    const result: QlikMetricsData[] = [];
+    const relevantWeeks = [...weekPSPTotals.keys()].sort();
 
     for (const week of relevantWeeks) {
+      const pspTotals = weekPSPTotals.get(week)!;
       const weekPSPData: QlikMetricsData = {
         week,
         totalPressBuy: 0,
@@ -229,18 +281,11 @@ export class QlikStyleProcessor {
         pspBreakdown: []
       };
 
+      // 按选中顺序输出每个PSP，本周没有数据的PSP记为0
       for (const psp of selectedPSPs) {
-        const pspFilteredData = data.filter(item =>
-          item.psp === psp &&
-          item.week === week &&
-          (selectedCountries.length === 0 || selectedCountries.includes(item.country)) &&
-          (selectedPaymentOptions.length === 0 ||
-           !item.lastSelectedPaymentOption ||
-           selectedPaymentOptions.includes(item.lastSelectedPaymentOption))
-        );
-
-        const pspPressBuy = pspFilteredData.reduce((sum, item) => sum + item.pressBuyCount, 0);
-        const pspConverted = pspFilteredData.reduce((sum, item) => sum + item.convertedCount, 0);
+        const totals = pspTotals.get(psp);
+        const pspPressBuy = totals ? totals.pressBuy : 0;
+        const pspConverted = totals ? totals.converted : 0;
         const pspConversionRate = pspPressBuy > 0 ? (pspConverted / pspPressBuy) * 100 : 0;
 
         // 更新本周的总计
@@ -1,7 +1,105 @@
 import * as XLSX from 'xlsx';
 import { WeeklyData, FilterOptions } from '../types';
+import { PersistentCache } from './persistentCache';
+
+type ParseResult = {
+  data: WeeklyData[];
+  filterOptions: FilterOptions;
+};
+
+type ColumnTarget = 'week' | 'country' | 'psp' | 'pressBuy' | 'converted' | 'paymentOption';
+
+interface ColumnMatch {
+  exact: number[];  // 与候选列名精确匹配（忽略大小写）的列索引，按优先级排列
+  fuzzy: number[];  // 通过子串匹配找到的备选列索引
+}
+
+type ColumnMap = Record<ColumnTarget, ColumnMatch>;
+
+// 各字段可能的列名，按优先级排列（比较时忽略大小写）
+const COLUMN_CANDIDATES: Record<ColumnTarget, string[]> = {
+  week: [
+    'Year Week', 'YearWeek', 'year_week', // 实际Excel文件中的列名
+    'Week', 'Date', 'Week Ending', 'WEEK_ENDING', 'WeekEnding', 'Period', 'Time Period',
+    'Week Num', 'WeekNum', 'Week Number', 'WeekNumber'
+  ],
+  country: [
+    'Country', 'Market', 'Region', 'Location', 'Country Code', 'CountryCode', 'CountryName'
+  ],
+  psp: [
+    'PSP', // 实际Excel文件中的列名
+    'Partner Name', 'partner_name', 'PartnerName', 'Partner',
+    'Payment Service Provider', 'Provider',
+    'PSP_NAME', 'PspName', 'Payment Provider', 'Payment Processor',
+    'Payment Gateway', 'PaymentServiceProvider', 'Gateway', 'Processor'
+  ],
+  pressBuy: [
+    '# Press Buy', '#Press Buy', 'Press Buy', // 实际Excel文件中的列名
+    'Press Buy Count', 'press_buy_count', 'PressBuyCount',
+    'Buy Count', 'press_buy', 'PressBuy', 'Buys', 'Total Buys',
+    'PressBuys', 'Purchases', 'Press Purchases', 'Buy Volume'
+  ],
+  converted: [
+    '# Converted', '#Converted', 'Converted', // 实际Excel文件中的列名
+    'Converted Count', 'converted_count', 'ConvertedCount',
+    'Conversion Count', 'Conversions', 'Success',
+    'Converted Buys', 'Successful Conversions', 'Complete', 'Completed',
+    'ConvertedBuys', 'Successful Purchases'
+  ],
+  paymentOption: [
+    'Last Selected Payment Option (Group)', 'Last Selected Payment Option', // 实际Excel文件中的列名
+    'last_selected_payment_option', 'Payment Option',
+    'Payment Method', 'Payment Type', 'Payment Type Group', 'Payment Type (Group)',
+    'Payment Method Type', 'PaymentOption', 'PaymentMethod', 'Last Payment Option',
+    'Selected Payment', 'SelectedPayment', 'PaymentGroup', 'Payment Group'
+  ]
+};
+
+// 候选列名都不存在时，通过子串匹配（小写列名）查找
+const COLUMN_PATTERNS: Record<ColumnTarget, (lowerKey: string) => boolean> = {
+  week: key => key.includes('week') || key.includes('period') || key.includes('date'),
+  country: key => key.includes('country') || key.includes('market') || key.includes('region'),
+  psp: key => key.includes('partner') || key.includes('psp') ||
+    key.includes('payment') || key.includes('provider') || key.includes('gateway'),
+  pressBuy: key => (key.includes('press') && key.includes('buy')) ||
+    key.includes('purchase') || key === 'buys',
+  converted: key => key.includes('convert') || key.includes('success') || key.includes('complete'),
+  paymentOption: key => key.includes('payment') && (key.includes('option') ||
+    key.includes('method') || key.includes('type') || key.includes('group'))
+};
+
+// 解析结果的缓存版本，修改解析逻辑或输出结构时需递增，使浏览器中持久化的旧结果失效
+const PARSE_CACHE_VERSION = 1;
 
 export class XLSXParser {
+  // 按文件内容缓存解析结果，重复上传同一文件时跳过解析和处理
+  // 只保留最近一次的结果，避免多次上传大文件后内存持续增长
+  private static parseCache = new Map<string, ParseResult>();
+
+  // 按表头缓存列识别结果
+  private static columnCache = new Map<string, ColumnMap>();
+
+  /**
+   * 根据文件内容生成缓存键，persistable 表示该键是否基于内容哈希、可以跨会话持久化
+   */
+  private static async getCacheKey(file: File, buffer: ArrayBuffer): Promise<{ key: string; persistable: boolean }> {
+    // crypto.subtle 仅在安全上下文中可用，否则退回到文件元数据（仅用于内存缓存）
+    if (window.crypto?.subtle) {
+      const digest = await window.crypto.subtle.digest('SHA-256', buffer);
+      const hash = Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
+      return { key: `v${PARSE_CACHE_VERSION}:${hash}`, persistable: true };
+    }
+    return { key: `${file.name}:${file.size}:${file.lastModified}`, persistable: false };
+  }
+
+  /**
+   * 写入内存缓存，只保留最近一次的解析结果
+   */
+  private static rememberParseResult(cacheKey: string, result: ParseResult): void {
+    this.parseCache.clear();
+    this.parseCache.set(cacheKey, result);
+  }
+
   /**
    * 解析可能包含千位分隔符的数字字符串
    */
@@ -50,10 +148,7 @@ export class XLSXParser {
     return partnerName;
   }
 
-  static async parseFile(file: File): Promise<{
-    data: WeeklyData[];
-    filterOptions: FilterOptions;
-  }> {
+  static async parseFile(file: File): Promise<ParseResult> {
     // 检查文件大小，如果太大则警告
     const MAX_FILE_SIZE = 50 * 1024 * 1024; // 50MB
     if (file.size > MAX_FILE_SIZE) {
@@ -73,13 +168,31 @@ export class XLSXParser {
 
         try {
           console.log('Starting to parse Excel file...');
-          const data = new Uint8Array(e.target?.result as ArrayBuffer);
+          const buffer = e.target?.result as ArrayBuffer;
+          const data = new Uint8Array(buffer);
 
           // 添加内存检查
           if (data.length === 0) {
             throw new Error('File appears to be empty');
           }
 
+          const { key: cacheKey, persistable } = await this.getCacheKey(file, buffer);
+          const cached = this.parseCache.get(cacheKey);
+          if (cached) {
+            console.log('Using cached parse result for', file.name);
+            resolve(cached);
+            return;
+          }
+
+          // 跨会话缓存：刷新页面后重新上传同一文件时跳过解析
+          const persisted = persistable ? await PersistentCache.get<ParseResult>(cacheKey) : undefined;
+          if (persisted) {
+            console.log('Using persisted parse result for', file.name);
+            this.rememberParseResult(cacheKey, persisted);
+            resolve(persisted);
+            return;
+          }
+
           // 优化XLSX读取选项
           const workbook = XLSX.read(data, {
             type: 'array',
@@ -87,7 +200,8 @@ export class XLSXParser {
             cellHTML: false,         // 不读取HTML
             cellNF: false,           // 不读取数字格式
             cellDates: false,        // 不自动解析日期
-            bookProps: false         // 不读取文档属性
+            bookProps: false,        // 不读取文档属性
+            sheets: 0                // 只解析第一个工作表，其余工作表不加载
           });
 
           console.log('Workbook sheets:', workbook.SheetNames);
@@ -100,32 +214,41 @@ export class XLSXParser {
           const worksheet = workbook.Sheets[workbook.SheetNames[0]];
 
           // 检查工作表是否为空
-          if (!worksheet || Object.keys(worksheet).length === 0) {
+          if (!worksheet || !worksheet['!ref']) {
             throw new Error('First worksheet is empty');
           }
 
-          const jsonData = XLSX.utils.sheet_to_json(worksheet, {
+          // 第一步：只读取表头行并识别需要的列
+          const sheetRange = XLSX.utils.decode_range(worksheet['!ref']);
+          const [headerRow = []] = XLSX.utils.sheet_to_json<any[]>(worksheet, {
+            header: 1,
+            raw: false,
+            defval: '',
+            range: { s: sheetRange.s, e: { r: sheetRange.s.r, c: sheetRange.e.c } }
+          });
+          const header = headerRow.map(cell => cell.toString());
+          console.log('Available columns:', header);
+
+          const { firstColumn, lastColumn, columns } = this.selectColumnRange(this.detectColumns(header), header.length);
+
+          // 第二步：只读取用到的列范围，按行返回数组，不为每行构建包含所有列名的对象
+          const jsonData = XLSX.utils.sheet_to_json<any[]>(worksheet, {
+            header: 1,
             raw: false,           // 返回格式化的值而不是原始值
-            defval: ''            // 空单元格用空字符串填充
+            defval: '',           // 空单元格用空字符串填充
+            blankrows: false,     // 跳过空行
+            range: {
+              s: { r: sheetRange.s.r + 1, c: sheetRange.s.c + firstColumn },
+              e: { r: sheetRange.e.r, c: sheetRange.s.c + lastColumn }
+            }
           });
 
-          console.log('Raw data rows:', jsonData.length);
+          console.log(`Raw data rows: ${jsonData.length}, reading columns ${firstColumn + 1}-${lastColumn + 1} of ${header.length}`);
           if (jsonData.length > 0) {
             console.log('Sample row (first 5 rows):');
             for (let i = 0; i < Math.min(5, jsonData.length); i++) {
               console.log(`  Row ${i + 1}:`, jsonData[i]);
             }
-            console.log('Available columns:', Object.keys(jsonData[0] as any));
-
-            // 检查关键列的数据范围
-            if ('# Press Buy' in (jsonData[0] as any)) {
-              const pressBuys = jsonData.map((row: any) => Number(row['# Press Buy']) || 0);
-              console.log(`'# Press Buy' column - Min: ${Math.min(...pressBuys)}, Max: ${Math.max(...pressBuys)}, Sum: ${pressBuys.reduce((a, b) => a + b, 0)}`);
-            }
-            if ('# Converted' in (jsonData[0] as any)) {
-              const converted = jsonData.map((row: any) => Number(row['# Converted']) || 0);
-              console.log(`'# Converted' column - Min: ${Math.min(...converted)}, Max: ${Math.max(...converted)}, Sum: ${converted.reduce((a, b) => a + b, 0)}`);
-            }
           }
 
           if (jsonData.length === 0) {
@@ -133,7 +256,7 @@ export class XLSXParser {
           }
 
           // 使用批处理来处理大数据集
-          const processedData = await this.processDataInBatches(jsonData);
+          const processedData = await this.processDataInBatches(jsonData, columns);
           console.log('📊 XLSX Processing Results:');
           console.log('  Raw data rows:', jsonData.length);
           console.log('  Processed data rows:', processedData.length);
@@ -155,10 +278,15 @@ export class XLSXParser {
           const filterOptions = this.extractFilterOptions(processedData);
           console.log('Filter options:', filterOptions);
 
-          resolve({
+          const result: ParseResult = {
             data: processedData,
             filterOptions
-          });
+          };
+          this.rememberParseResult(cacheKey, result);
+          if (persistable) {
+            void PersistentCache.set(cacheKey, result);
+          }
+          resolve(result);
         } catch (error) {
           console.error('Error parsing Excel file:', error);
           reject(new Error(`Failed to parse Excel file: ${error instanceof Error ? error.message : 'Unknown error'}`));
@@ -185,7 +313,7 @@ export class XLSXParser {
     });
   }
 
-  private static async processDataInBatches(rawData: any[]): Promise<WeeklyData[]> {
+  private static async processDataInBatches(rawData: any[][], columns: ColumnMap): Promise<WeeklyData[]> {
     console.log('Processing data rows in batches...');
     const BATCH_SIZE = 1000; // 每批处理1000行
     const processedData: WeeklyData[] = [];
@@ -195,7 +323,7 @@ export class XLSXParser {
       const batch = rawData.slice(i, i + BATCH_SIZE);
       console.log(`Processing batch ${Math.floor(i / BATCH_SIZE) + 1}/${Math.ceil(rawData.length / BATCH_SIZE)}`);
 
-      const batchResults = this.processBatch(batch);
+      const batchResults = this.processBatch(batch, columns);
       processedData.push(...batchResults);
 
       // 让出控制权给浏览器，防止UI冻结
@@ -210,29 +338,30 @@ export class XLSXParser {
     return this.calculateShares(processedData);
   }
 
-  private static processBatch(batch: any[]): WeeklyData[] {
+  private static processBatch(batch: any[][], columns: ColumnMap): WeeklyData[] {
     const processedData: WeeklyData[] = [];
 
     for (let i = 0; i < batch.length; i++) {
       const row = batch[i];
       try {
-        const week = this.extractWeek(row);
-        const country = this.extractCountry(row);
-        const psp = this.extractPSP(row);
-        const pressBuyCount = this.extractPressBuyCount(row);
-        const convertedCount = this.extractConvertedCount(row);
-        const lastSelectedPaymentOption = this.extractLastSelectedPaymentOption(row);
+        const week = this.extractWeek(row, columns);
+        const country = this.extractCountry(row, columns);
+        const psp = this.extractPSP(row, columns);
+        const pressBuyCount = this.extractPressBuyCount(row, columns);
+        const convertedCount = this.extractConvertedCount(row, columns);
+        const lastSelectedPaymentOption = this.extractLastSelectedPaymentOption(row, columns);
 
         if (week && country && psp) {
-          const conversionRate = pressBuyCount > 0 ? (convertedCount / pressBuyCount) * 100 : 0;
+          // 直接按两位小数取整，避免 toFixed 的字符串往返
+          const conversionRate = pressBuyCount > 0 ? Math.round((convertedCount / pressBuyCount) * 10000) / 100 : 0;
 
           processedData.push({
             week,
             country: country.toString().trim(),
             psp: psp.toString().trim(),
-            pressBuyCount: Number(pressBuyCount) || 0,
-            convertedCount: Number(convertedCount) || 0,
-            conversionRate: Number(conversionRate.toFixed(2)),
+            pressBuyCount,
+            convertedCount,
+            conversionRate,
             pressBuyShare: 0, // 稍后计算
             convertedShare: 0, // 稍后计算
             lastSelectedPaymentOption: lastSelectedPaymentOption?.toString().trim()
@@ -244,7 +373,7 @@ export class XLSXParser {
             week: !!week,
             country: !!country,
             psp: !!psp,
-            availableKeys: Object.keys(row)
+            row
           });
         }
       } catch (error) {
@@ -263,31 +392,28 @@ export class XLSXParser {
     console.log('Calculating shares...');
     const startTime = Date.now();
 
-    // 按国家分组来计算shares（不是按国家+周）
-    const countryGroups = new Map<string, WeeklyData[]>();
+    // 按国家汇总总量来计算shares（不是按国家+周），不为每个国家构建分组数组
+    const countryTotals = new Map<string, { pressBuy: number; converted: number }>();
 
     for (const item of data) {
-      if (!countryGroups.has(item.country)) {
-        countryGroups.set(item.country, []);
+      const totals = countryTotals.get(item.country);
+      if (totals) {
+        totals.pressBuy += item.pressBuyCount;
+        totals.converted += item.convertedCount;
+      } else {
+        countryTotals.set(item.country, { pressBuy: item.pressBuyCount, converted: item.convertedCount });
       }
-      countryGroups.get(item.country)!.push(item);
     }
 
-    // 为每个国家计算所有PSP的shares
-    for (const [country, countryData] of countryGroups.entries()) {
-      // 计算这个国家所有周、所有PSP的总数
-      const totalCountryPressBuy = countryData.reduce((sum, item) => sum + item.pressBuyCount, 0);
-      const totalCountryConverted = countryData.reduce((sum, item) => sum + item.convertedCount, 0);
-
-      console.log(`Country ${country}: Total Press Buy: ${totalCountryPressBuy}, Total Converted: ${totalCountryConverted}`);
-
-      // 为这个国家的每个PSP计算share
-      for (const item of countryData) {
-        item.pressBuyShare = totalCountryPressBuy > 0 ? (item.pressBuyCount / totalCountryPressBuy) * 100 : 0;
-        item.convertedShare = totalCountryConverted > 0 ? (item.convertedCount / totalCountryConverted) * 100 : 0;
+    for (const [country, totals] of countryTotals.entries()) {
+      console.log(`Country ${country}: Total Press Buy: ${totals.pressBuy}, Total Converted: ${totals.converted}`);
+    }
 
-        console.log(`  - PSP ${item.psp} (${item.week}): Press Buy: ${item.pressBuyCount}, Share: ${item.pressBuyShare.toFixed(2)}%`);
-      }
+    // 用国家总量计算每行的share
+    for (const item of data) {
+      const totals = countryTotals.get(item.country)!;
+      item.pressBuyShare = totals.pressBuy > 0 ? (item.pressBuyCount / totals.pressBuy) * 100 : 0;
+      item.convertedShare = totals.converted > 0 ? (item.convertedCount / totals.converted) * 100 : 0;
     }
 
     const endTime = Date.now();
@@ -296,199 +422,150 @@ export class XLSXParser {
     return data;
   }
 
-  // 以下方法需要根据实际xlsx文件的列名进行调整
-  private static extractWeek(row: any): string {
-    // 尝试可能的周列名 - 扩展更多可能性
-    const weekFields = [
-      'Year Week', 'YearWeek', 'YearWeek', 'year_week', // 实际Excel文件中的列名
-      'Week', 'week', 'Date', 'date', 'Week Ending', 'WEEK', 'WEEK_ENDING',
-      'week_ending', 'WeekEnding', 'Period', 'period', 'Time Period',
-      'Week Num', 'WeekNum', 'Week Number', 'WeekNumber'
-    ];
-
-    for (const field of weekFields) {
-      if (row[field] !== undefined && row[field] !== null && row[field] !== '') {
-        const value = row[field].toString();
-        // 清理可能的日期格式
-        if (value.includes('-') || value.includes('/')) {
-          // 如果是日期格式，可以进一步处理
-          return value;
+  /**
+   * 根据表头一次性识别各字段对应的列
+   * 候选列名按小写建立查找表，精确匹配优先，其次是子串匹配
+   */
+  private static detectColumns(header: string[]): ColumnMap {
+    // 表头相同的文件（如每月导出的同一报表）直接复用识别结果
+    const headerKey = header.join('\u0000');
+    const cachedColumns = this.columnCache.get(headerKey);
+    if (cachedColumns) {
+      return cachedColumns;
+    }
+
+    const indicesByLowerName = new Map<string, number[]>();
+    header.forEach((name, index) => {
+      const lowerName = name.toLowerCase();
+      const existing = indicesByLowerName.get(lowerName);
+      if (existing) {
+        existing.push(index);
+      } else {
+        indicesByLowerName.set(lowerName, [index]);
+      }
+    });
+
+    const columns = {} as ColumnMap;
+    for (const target of Object.keys(COLUMN_CANDIDATES) as ColumnTarget[]) {
+      const exact: number[] = [];
+      for (const candidate of COLUMN_CANDIDATES[target]) {
+        for (const index of indicesByLowerName.get(candidate.toLowerCase()) || []) {
+          if (!exact.includes(index)) {
+            exact.push(index);
+          }
         }
-        return value;
       }
-    }
 
-    // 如果所有标准字段都没有找到，尝试通过前缀匹配
-    const keys = Object.keys(row);
-    for (const key of keys) {
-      const lowerKey = key.toLowerCase();
-      if (lowerKey.includes('week') || lowerKey.includes('period') || lowerKey.includes('date')) {
-        const value = row[key];
-        if (value !== undefined && value !== null && value !== '') {
-          return value.toString();
+      const fuzzy: number[] = [];
+      for (const [lowerName, matchedIndices] of indicesByLowerName.entries()) {
+        if (COLUMN_PATTERNS[target](lowerName)) {
+          fuzzy.push(...matchedIndices.filter(index => !exact.includes(index)));
         }
       }
+
+      columns[target] = { exact, fuzzy };
     }
 
-    return '';
+    console.log('Detected columns:', columns);
+    this.columnCache.set(headerKey, columns);
+    return columns;
   }
 
-  private static extractCountry(row: any): string {
-    const countryFields = [
-      'Country', 'country', 'Market', 'market', 'COUNTRY', 'MARKET',
-      'Region', 'region', 'Location', 'location', 'Country Code',
-      'CountryCode', 'CountryName'
-    ];
-
-    for (const field of countryFields) {
-      if (row[field] !== undefined && row[field] !== null && row[field] !== '') {
-        return row[field].toString();
-      }
+  /**
+   * 计算需要读取的最小列范围，并将列索引换算为相对于该范围的位置
+   */
+  private static selectColumnRange(columns: ColumnMap, columnCount: number): {
+    firstColumn: number;
+    lastColumn: number;
+    columns: ColumnMap;
+  } {
+    const usedIndices = Object.values(columns).flatMap(match => [...match.exact, ...match.fuzzy]);
+    if (usedIndices.length === 0) {
+      return { firstColumn: 0, lastColumn: Math.max(columnCount - 1, 0), columns };
     }
 
-    // 通过前缀匹配
-    const keys = Object.keys(row);
-    for (const key of keys) {
-      const lowerKey = key.toLowerCase();
-      if (lowerKey.includes('country') || lowerKey.includes('market') || lowerKey.includes('region')) {
-        const value = row[key];
-        if (value !== undefined && value !== null && value !== '') {
-          return value.toString();
-        }
-      }
+    const firstColumn = Math.min(...usedIndices);
+    const lastColumn = Math.max(...usedIndices);
+    const shifted = {} as ColumnMap;
+    for (const target of Object.keys(columns) as ColumnTarget[]) {
+      shifted[target] = {
+        exact: columns[target].exact.map(index => index - firstColumn),
+        fuzzy: columns[target].fuzzy.map(index => index - firstColumn)
+      };
     }
 
-    return '';
+    return { firstColumn, lastColumn, columns: shifted };
   }
 
-  private static extractPSP(row: any): string {
-    // 优先从PSP字段提取（实际Excel文件中的列名）
-    const partnerFields = [
-      'PSP', 'psp', // 实际Excel文件中的列名
-      'Partner Name', 'partner_name', 'PartnerName', 'Partner',
-      'partner', 'Payment Service Provider', 'Provider',
-      'PSP_NAME', 'PspName', 'Payment Provider', 'Payment Processor',
-      'Payment Gateway', 'Psp', 'PaymentServiceProvider', 'Gateway', 'Processor'
-    ];
-
-    for (const field of partnerFields) {
-      if (row[field] !== undefined && row[field] !== null && row[field] !== '') {
-        const value = row[field].toString().trim();
-
-        // 使用智能PSP提取逻辑
-        return this.extractCorePSP(value);
+  /**
+   * 按识别出的列顺序取第一个非空值
+   */
+  private static extractValue(row: any[], match: ColumnMatch): any {
+    for (const index of match.exact) {
+      const value = row[index];
+      if (value !== undefined && value !== null && value !== '') {
+        return value;
       }
     }
 
-    // 通过前缀匹配
-    const keys = Object.keys(row);
-    for (const key of keys) {
-      const lowerKey = key.toLowerCase();
-      if (lowerKey.includes('partner') || lowerKey.includes('psp') ||
-          lowerKey.includes('payment') || lowerKey.includes('provider') ||
-          lowerKey.includes('gateway')) {
-        const value = row[key];
-        if (value !== undefined && value !== null && value !== '') {
-          // 使用智能PSP提取逻辑
-          return this.extractCorePSP(value.toString().trim());
-        }
+    for (const index of match.fuzzy) {
+      const value = row[index];
+      if (value !== undefined && value !== null && value !== '') {
+        return value;
       }
     }
 
-    return '';
+    return undefined;
   }
 
-  private static extractPressBuyCount(row: any): number {
-    const pressBuyFields = [
-      '# Press Buy', '#Press Buy', 'Press Buy', // 实际Excel文件中的列名
-      'Press Buy Count', 'press_buy_count', 'PressBuyCount',
-      'Buy Count', 'press_buy', 'PressBuy', 'BUYS', 'Buys', 'Total Buys',
-      'PressBuys', 'Purchases', 'Press Purchases', 'Buy Volume'
-    ];
-
-    for (const field of pressBuyFields) {
-      if (row[field] !== undefined && row[field] !== null && row[field] !== '') {
-        return this.parseNumber(row[field]);
+  /**
+   * 数值字段：精确匹配取第一个非空值，子串匹配取第一个非零值
+   */
+  private static extractNumber(row: any[], match: ColumnMatch): number {
+    for (const index of match.exact) {
+      const value = row[index];
+      if (value !== undefined && value !== null && value !== '') {
+        return this.parseNumber(value);
       }
     }
 
-    // 通过前缀匹配
-    const keys = Object.keys(row);
-    for (const key of keys) {
-      const lowerKey = key.toLowerCase();
-      if (lowerKey.includes('press') && lowerKey.includes('buy') ||
-          lowerKey.includes('purchase') || lowerKey === 'buys') {
-        const value = this.parseNumber(row[key]);
-        if (value !== 0) {
-          return value;
-        }
+    for (const index of match.fuzzy) {
+      const value = this.parseNumber(row[index]);
+      if (value !== 0) {
+        return value;
       }
     }
 
     return 0;
   }
 
-  private static extractConvertedCount(row: any): number {
-    const convertedFields = [
-      '# Converted', '#Converted', 'Converted', // 实际Excel文件中的列名
-      'Converted Count', 'converted_count', 'ConvertedCount',
-      'Conversion Count', 'conversions', 'Conversions', 'SUCCESS', 'Success',
-      'Converted Buys', 'Successful Conversions', 'Complete', 'Completed',
-      'ConvertedBuys', 'Successful Purchases'
-    ];
-
-    for (const field of convertedFields) {
-      if (row[field] !== undefined && row[field] !== null && row[field] !== '') {
-        return this.parseNumber(row[field]);
-      }
-    }
+  private static extractWeek(row: any[], columns: ColumnMap): string {
+    const value = this.extractValue(row, columns.week);
+    return value !== undefined ? value.toString() : '';
+  }
 
-    // 通过前缀匹配
-    const keys = Object.keys(row);
-    for (const key of keys) {
-      const lowerKey = key.toLowerCase();
-      if (lowerKey.includes('convert') || lowerKey.includes('success') ||
-          lowerKey.includes('complete')) {
-        const value = this.parseNumber(row[key]);
-        if (value !== 0) {
-          return value;
-        }
-      }
-    }
+  private static extractCountry(row: any[], columns: ColumnMap): string {
+    const value = this.extractValue(row, columns.country);
+    return value !== undefined ? value.toString() : '';
+  }
 
-    return 0;
+  private static extractPSP(row: any[], columns: ColumnMap): string {
+    const value = this.extractValue(row, columns.psp);
+    // 使用智能PSP提取逻辑
+    return value !== undefined ? this.extractCorePSP(value.toString().trim()) : '';
   }
 
-  private static extractLastSelectedPaymentOption(row: any): string | undefined {
-    const paymentFields = [
-      'Last Selected Payment Option (Group)', 'Last Selected Payment Option', // 实际Excel文件中的列名
-      'last_selected_payment_option', 'Payment Option',
-      'Payment Method', 'Payment Type', 'Payment Type Group', 'Payment Type (Group)',
-      'Payment Method Type', 'PaymentOption', 'PaymentMethod', 'Last Payment Option',
-      'Selected Payment', 'SelectedPayment', 'PaymentGroup', 'Payment Group'
-    ];
-
-    for (const field of paymentFields) {
-      if (row[field] !== undefined && row[field] !== null && row[field] !== '') {
-        return row[field].toString();
-      }
-    }
+  private static extractPressBuyCount(row: any[], columns: ColumnMap): number {
+    return this.extractNumber(row, columns.pressBuy);
+  }
 
-    // 通过前缀匹配
-    const keys = Object.keys(row);
-    for (const key of keys) {
-      const lowerKey = key.toLowerCase();
-      if (lowerKey.includes('payment') && (lowerKey.includes('option') ||
-          lowerKey.includes('method') || lowerKey.includes('type') ||
-          lowerKey.includes('group'))) {
-        const value = row[key];
-        if (value !== undefined && value !== null && value !== '') {
-          return value.toString();
-        }
-      }
-    }
+  private static extractConvertedCount(row: any[], columns: ColumnMap): number {
+    return this.extractNumber(row, columns.converted);
+  }
 
-    return undefined;
+  private static extractLastSelectedPaymentOption(row: any[], columns: ColumnMap): string | undefined {
+    const value = this.extractValue(row, columns.paymentOption);
+    return value !== undefined ? value.toString() : undefined;
   }
 
   private static extractFilterOptions(data: WeeklyData[]): FilterOptions {